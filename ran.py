@@ -1,328 +1,434 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import io
+import hashlib
+from streamlit.runtime.uploaded_file_manager import UploadedFile
 
-# Load data function
-@st.cache_data
+# Special customers whose same day orders only count if picked before 3PM
+SAME_DAY_SPECIAL_CUSTOMERS = frozenset([
+    'WESTSIDE UNIT OF TRENT LIMITED', 
+    'TATA CLiQ', 
+    'ZISHTA TRADITIONS PRIVATE LIMITED', 
+    'Heads Up for Tails HUFT'
+])
+
+# Special customers whose orders picked after 3PM are tracked as next day orders
+NEXT_DAY_SPECIAL_CUSTOMERS = frozenset([
+    'WESTSIDE UNIT OF TRENT LIMITED', 
+    'TATA CLiQ', 
+    'ZISHTA TRADITIONS PRIVATE LIMITED', 
+    'Ugaoo',
+    'Heads Up for Tails HUFT'
+])
+
+# Identify an uploaded file by the SHA-256 of its bytes, so the same file is only parsed once
+def file_digest(uploaded_file):
+    return hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+
+# Columns of the same day and next day tables
+SAME_DAY_COLUMNS = ['Date', 'Hub', 'Same day Orders', 'Attempted', 'Attempted %', 'Delivered', 'Delivered %']
+NEXT_DAY_COLUMNS = [
+    'Date', 'Hub', 'Next day Orders', 'Attempted', 'Attempted %', 'Delivered', 'Delivered %',
+    'Attempted Previous Day', 'Attempted Current Day', 'Delivered Previous Day', 'Delivered Current Day'
+]
+
+# Precomputed day bucket column of each date column
+DAY_COLUMNS = {'Picked on': '_picked_day', 'First attempted on': '_attempted_day', 'Delivered on': '_delivered_day'}
+
+# Load data function, returning the data and its month split (see split_months)
+@st.cache_data(hash_funcs={UploadedFile: file_digest})
 def load_data(uploaded_file):
-    df = pd.read_csv(uploaded_file)
+    # Peek at the header first: the hub column name is only known from it
+    source_columns = list(pd.read_csv(uploaded_file, nrows=0).columns)
+    uploaded_file.seek(0)
+    
+    # Only the columns the app uses (plus the hub column, if any) are parsed at all
+    hub_column = find_hub_column(source_columns)
+    used_cols = ['Customer', 'Picked on', 'First attempted on', 'Delivered on', hub_column]
+    
+    # Parse with the multithreaded Arrow CSV reader: date columns are parsed while reading
+    # and Customer is dictionary encoded, which converts to a pandas categorical.
+    # Blank/NA text cells become missing values, as with pd.read_csv, instead of ''
+    table = pacsv.read_csv(
+        uploaded_file,
+        convert_options=pacsv.ConvertOptions(
+            include_columns=[col for col in source_columns if col in used_cols],
+            strings_can_be_null=True,
+            timestamp_parsers=['%m-%d-%Y %H:%M'],
+            column_types={'Customer': pa.dictionary(pa.int32(), pa.string())}
+        )
+    )
+    df = table.to_pandas()
+    df.attrs['source_columns'] = source_columns
+    df.attrs['digest'] = file_digest(uploaded_file)
     
-    # Convert date columns to datetime
+    # Date columns Arrow could not parse as a whole fall back to pandas, blanking invalid values;
+    # cache=True parses each distinct (often repeated minute-stamp) string only once
     date_cols = ['Picked on', 'First attempted on', 'Delivered on']
     for col in date_cols:
-        df[col] = pd.to_datetime(df[col], format='%m-%d-%Y %H:%M', errors='coerce')
-    
-    return df
+        if not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], format='%m-%d-%Y %H:%M', errors='coerce', cache=True)
+    
+    # Keep customers in alphabetical order, as with the default pandas reader
+    df['Customer'] = df['Customer'].cat.reorder_categories(sorted(df['Customer'].cat.categories))
+    
+    # Flag special customers once for the whole upload instead of in every processor: membership
+    # is decided once per category, then gathered row by row through the integer codes
+    codes = df['Customer'].cat.codes.to_numpy()
+    categories = df['Customer'].cat.categories
+    df['_is_special'] = special_category_mask(categories, SAME_DAY_SPECIAL_CUSTOMERS)[codes]
+    df['_is_special_next_day'] = special_category_mask(categories, NEXT_DAY_SPECIAL_CUSTOMERS)[codes]
+    
+    # Decompose the dates once for the whole upload instead of on every rerun: day buckets are kept
+    # as int64 day numbers (pandas can't hold datetime64[D]; NaT maps to the same sentinel) and are
+    # viewed back as datetime64[D] by day_buckets
+    for col, day_col in DAY_COLUMNS.items():
+        df[day_col] = df[col].values.astype('datetime64[D]').view(np.int64)
+    df['_picked_hour'] = df['Picked on'].dt.hour.fillna(-1).astype(np.int8)
+    df['_picked_month'] = df['Picked on'].dt.month.fillna(0).astype(np.int8)
+    
+    # Store hubs as a categorical with the hubs in order of first appearance in the file (before the
+    # rows are reordered below), so the hub list is read from its categories instead of scanning rows
+    if hub_column:
+        df[hub_column] = pd.Categorical(df[hub_column], categories=df[hub_column].dropna().unique())
+    
+    # Sort by pick time (blank times first, matching their int64 value) so a pick time window is
+    # a contiguous slice found with np.searchsorted; the original row labels are kept
+    df = df.sort_values('Picked on', kind='stable', na_position='first')
+    
+    return df, split_months(df)
 
-# Find hub column name
-def find_hub_column(df):
+# Find hub column name among the given columns
+def find_hub_column(columns):
     hub_column_candidates = ['Delivery hub', 'Hub', 'Delivery Hub', 'Delivery_hub', 'delivery_hub', 'delivery hub']
     for col in hub_column_candidates:
-        if col in df.columns:
+        if col in columns:
             return col
     return None
 
-# Filter data for specific month
-def filter_month_data(df, month):
-    df_month = df[df['Picked on'].dt.month == month]
-    return df_month
+# Whether each category is one of the given customers, indexable by category code; a trailing
+# False is appended so the -1 code of blank customers is never special
+def special_category_mask(categories, customers):
+    return np.append(np.fromiter((name in customers for name in categories), dtype=bool, count=len(categories)), False)
 
-# Process data for same day performance
-def process_same_day(df_month, hub_filter="All", hub_column=None):
-    same_day_data = []
-    
-    # Apply hub filter if specified and column exists
-    if hub_filter != "All" and hub_column and hub_column in df_month.columns:
-        df_month = df_month[df_month[hub_column] == hub_filter]
-    
-    # Get unique dates in the month
-    dates_in_month = pd.date_range(
-        start=df_month['Picked on'].min().replace(day=1),
-        end=df_month['Picked on'].max() + pd.Timedelta(days=1),
-        freq='D'
+# Split data into calendar months with a single groupby pass, keyed by month number
+def split_months(df):
+    # Each month maps to (year, month data): the month data holds that month of every year (rows stay
+    # sorted by pick time), the year is the earliest one
+    month_groups = {}
+    for month, df_month in df[df['_picked_month'].to_numpy() > 0].groupby('_picked_month'):
+        month_groups[month] = (df_month['Picked on'].iloc[0].year, df_month)
+    return month_groups
+
+# Number the hubs of a month's rows in order of their first appearance in the file among those rows
+# (by row label, as the rows are sorted by pick time), from the hub column's categorical codes;
+# missing hubs get -1. The categories themselves follow first appearance in the whole file, which
+# can differ from a single month's order, so the codes can't be used as they are
+def factorize_in_file_order(col):
+    codes = col.cat.codes.to_numpy()
+    has_hub = codes >= 0
+    first_row = np.full(len(col.cat.categories), np.iinfo(np.int64).max)
+    np.minimum.at(first_row, codes[has_hub], col.index.to_numpy()[has_hub])
+    present = np.flatnonzero(first_row < np.iinfo(np.int64).max)
+    order = present[np.argsort(first_row[present], kind='stable')]
+    rank = np.full(len(first_row), -1)
+    rank[order] = np.arange(len(order))
+    return np.where(has_hub, rank[codes], -1), col.cat.categories[order]
+
+# First day (as datetime64[D]) and number of days of a calendar month
+def month_bounds(year, month):
+    start = pd.Timestamp(year, month, 1)
+    return np.datetime64(start.date(), 'D'), start.days_in_month
+
+# Count rows per bucket in a single linear pass: all rows, then the rows set in each mask
+# (as int32, which is plenty for order counts and halves the tables' size)
+def count_by_bucket(bucket, n_buckets, *masks):
+    counts = [np.bincount(bucket, minlength=n_buckets).astype(np.int32)]
+    for mask in masks:
+        counts.append(np.bincount(bucket[mask], minlength=n_buckets).astype(np.int32))
+    return counts
+
+# Percentage of count in total for whole arrays at once, rounded to 2 decimals (0 where total is 0)
+def percentage(count, total):
+    return np.round(np.where(total > 0, count / np.maximum(total, 1) * 100, 0.0), 2).astype(np.float32)
+
+# Day buckets of a date column (precomputed in load_data) as a numpy datetime64[D] array, without copying
+def day_buckets(df, col):
+    return df[DAY_COLUMNS[col]].to_numpy().view('datetime64[D]')
+
+# Build the same day table from the hub codes and day buckets of a month's orders, over the n_days days from first_day
+def same_day_table(hubs, first_day, n_days, hub_codes, picked_day, attempted_day, delivered_day, valid):
+    # Count valid/attempted/delivered orders per (hub, picked date) within those days
+    keep = (hub_codes >= 0) & (picked_day >= first_day) & (picked_day < first_day + n_days)
+    picked, orders, attempted, delivered = count_by_bucket(
+        hub_codes[keep] * n_days + (picked_day[keep] - first_day).astype(np.int64),
+        len(hubs) * n_days,
+        valid[keep],
+        (valid & (attempted_day == picked_day))[keep],
+        (valid & (delivered_day == picked_day))[keep]
     )
     
-    # Define special customers
-    special_customers = [
-        'WESTSIDE UNIT OF TRENT LIMITED', 
-        'TATA CLiQ', 
-        'ZISHTA TRADITIONS PRIVATE LIMITED', 
-        'Heads Up for Tails HUFT'
-    ]
+    # Only report hub days with picked orders
+    buckets = np.flatnonzero(picked)
+    hub_index, days = np.divmod(buckets, n_days)
+    orders, attempted, delivered = orders[buckets], attempted[buckets], delivered[buckets]
+    
+    # Calculate percentages
+    attempted_pct = percentage(attempted, orders)
+    delivered_pct = percentage(delivered, orders)
+    
+    return pd.DataFrame({
+        'Date': pd.array(np.datetime_as_string(first_day + days), dtype='string[pyarrow]'),
+        'Hub': hubs.to_numpy()[hub_index],
+        'Same day Orders': orders,
+        'Attempted': attempted,
+        'Attempted %': attempted_pct,
+        'Delivered': delivered,
+        'Delivered %': delivered_pct
+    })
+
+# Build the next day table from the hub codes and day buckets of the special customer orders picked after 3PM;
+# each hub covers its own calendar month (first day and number of days per hub code)
+def next_day_table(hubs, hub_month_start, hub_n_days, hub_codes, pick_date, attempted_date, delivered_date):
+    # Each order counts towards the day after it was picked, if that day is in its hub's month
+    next_date = pick_date + np.timedelta64(1, 'D')
+    row_hub = np.where(hub_codes >= 0, hub_codes, 0)
+    day_of_month = (next_date - hub_month_start[row_hub]).astype(np.int64)
+    keep = (hub_codes >= 0) & (day_of_month >= 0) & (day_of_month < hub_n_days[row_hub])
+    hub_codes, pick_date, next_date = hub_codes[keep], pick_date[keep], next_date[keep]
+    attempted_date, delivered_date = attempted_date[keep], delivered_date[keep]
+    
+    # Attempted/Delivered on the previous day (same day as picked) or the current date (next day),
+    # counted per hub and day of the month
+    n_days = hub_n_days.max()
+    orders, attempted_prev, attempted_curr, delivered_prev, delivered_curr = count_by_bucket(
+        hub_codes * n_days + day_of_month[keep],
+        len(hubs) * n_days,
+        attempted_date == pick_date,
+        attempted_date == next_date,
+        delivered_date == pick_date,
+        delivered_date == next_date
+    )
     
-    for date in dates_in_month:
-        date_str = date.strftime('%Y-%m-%d')
-        
-        # Filter orders picked on this date
-        picked_orders = df_month[df_month['Picked on'].dt.date == date.date()]
-        
-        # Skip if no orders
-        if len(picked_orders) == 0:
-            continue
-            
-        # Split into special and regular customers
-        regular_orders = picked_orders[~picked_orders['Customer'].isin(special_customers)]
-        special_orders = picked_orders[picked_orders['Customer'].isin(special_customers)]
-        
-        # For special customers, only count if picked before 3PM
-        valid_special_orders = special_orders[special_orders['Picked on'].dt.hour < 15]
-        
-        # For regular customers, count all regardless of time
-        valid_regular_orders = regular_orders
-        
-        # Combine valid orders
-        valid_orders = pd.concat([valid_regular_orders, valid_special_orders])
-        
-        same_day_orders = len(valid_orders)
-        
-        # Attempted orders (first attempt on same day)
-        attempted = len(valid_orders[valid_orders['First attempted on'].dt.date == date.date()])
-        
-        # Delivered orders (delivered on same day)
-        delivered = len(valid_orders[valid_orders['Delivered on'].dt.date == date.date()])
-        
-        # Calculate percentages
-        attempted_pct = (attempted / same_day_orders * 100) if same_day_orders > 0 else 0
-        delivered_pct = (delivered / same_day_orders * 100) if same_day_orders > 0 else 0
-        
-        # Hub information
-        if hub_filter != "All" and hub_column and hub_column in df_month.columns:
-            hub = hub_filter
-        else:
-            hub = "All Hubs"
-        
-        same_day_data.append({
-            'Date': date_str,
-            'Hub': hub,
-            'Same day Orders': same_day_orders,
-            'Attempted': attempted,
-            'Attempted %': round(attempted_pct, 2),
-            'Delivered': delivered,
-            'Delivered %': round(delivered_pct, 2)
-        })
-    
-    return pd.DataFrame(same_day_data)
+    # Only report hub days with next day orders
+    buckets = np.flatnonzero(orders)
+    if len(buckets) == 0:
+        return pd.DataFrame(columns=NEXT_DAY_COLUMNS)
+    hub_index, days = np.divmod(buckets, n_days)
+    orders = orders[buckets]
+    attempted_prev, attempted_curr = attempted_prev[buckets], attempted_curr[buckets]
+    delivered_prev, delivered_curr = delivered_prev[buckets], delivered_curr[buckets]
+    
+    total_attempted = attempted_prev + attempted_curr
+    total_delivered = delivered_prev + delivered_curr
+    
+    # Calculate percentages
+    attempted_pct = percentage(total_attempted, orders)
+    delivered_pct = percentage(total_delivered, orders)
+    
+    return pd.DataFrame({
+        'Date': pd.array(np.datetime_as_string(hub_month_start[hub_index] + days), dtype='string[pyarrow]'),
+        'Hub': hubs.to_numpy()[hub_index],
+        'Next day Orders': orders,
+        'Attempted': total_attempted,
+        'Attempted %': attempted_pct,
+        'Delivered': total_delivered,
+        'Delivered %': delivered_pct,
+        'Attempted Previous Day': attempted_prev,
+        'Attempted Current Day': attempted_curr,
+        'Delivered Previous Day': delivered_prev,
+        'Delivered Current Day': delivered_curr
+    })
 
-# Process data for next day performance (special customers after 3PM only)
-def process_next_day(df_month, df_full, month_num, hub_filter="All", hub_column=None):
-    next_day_data = []
+# Build the same day and next day tables (next day: special customers after 3PM only) for a month
+# in one pass over its rows: one row per hub and day when grouped by hub_column,
+# otherwise one row per day for "All Hubs"
+def month_tables(df_month, df_full, month_num, hub_column=None):
+    # Nothing to count: skip building the day buckets and the previous month lookup
+    if df_month.empty:
+        return pd.DataFrame(columns=SAME_DAY_COLUMNS), pd.DataFrame(columns=NEXT_DAY_COLUMNS)
+    
+    # Hubs are numbered in order of first appearance; rows without a hub get -1 and are skipped
+    if hub_column:
+        hub_codes, hubs = factorize_in_file_order(df_month[hub_column])
+    else:
+        hub_codes, hubs = np.zeros(len(df_month), dtype=np.intp), pd.Index(["All Hubs"])
+    
+    # Day buckets and pick hour precomputed in load_data, shared by both tables
+    picked_day = day_buckets(df_month, 'Picked on')
+    attempted_day = day_buckets(df_month, 'First attempted on')
+    delivered_day = day_buckets(df_month, 'Delivered on')
+    after_3pm = df_month['_picked_hour'].to_numpy() >= 15
+    
+    # Special customers only count towards same day if picked before 3PM,
+    # regular customers count regardless of time
+    valid = ~(df_month['_is_special'].to_numpy() & after_3pm)
+    
+    # Same day covers every picked day in the month data, which spans several years if the upload does
+    first_day, last_day = picked_day.min(), picked_day.max()
+    same_day_df = same_day_table(
+        hubs, first_day, int((last_day - first_day).astype(np.int64)) + 1,
+        hub_codes, picked_day, attempted_day, delivered_day, valid
+    )
     
-    # Apply hub filter if specified and column exists
-    if hub_filter != "All" and hub_column and hub_column in df_month.columns:
-        df_month = df_month[df_month[hub_column] == hub_filter]
-    
-    # Get the first and last dates of the current month's data
-    min_date = df_month['Picked on'].min()
-    max_date = df_month['Picked on'].max()
-    
-    # Create date range for the entire month (not just days with data)
-    dates_in_month = pd.date_range(
-        start=datetime(min_date.year, month_num, 1),
-        end=datetime(min_date.year, month_num, 1) + pd.offsets.MonthEnd(1),
-        freq='D'
+    # The next day table covers the entire calendar month (not just days with data) of each hub's
+    # earliest year in the month data, so hubs that only have rows in a later year still get theirs
+    first_pick = np.full(len(hubs), np.iinfo(np.int64).max)
+    np.minimum.at(first_pick, hub_codes[hub_codes >= 0], picked_day.view(np.int64)[hub_codes >= 0])
+    hub_years = first_pick.view('datetime64[D]').astype('datetime64[Y]').astype(np.int64) + 1970
+    years, year_index = np.unique(hub_years, return_inverse=True)
+    bounds = [month_bounds(int(year), month_num) for year in years]
+    hub_month_start = np.array([month_start for month_start, n_days in bounds])[year_index]
+    hub_n_days = np.array([n_days for month_start, n_days in bounds])[year_index]
+    
+    # The first day of the month looks back at orders picked from 3PM on the last day of the previous
+    # month, which are only available in the full dataframe: a binary search on the sorted pick times
+    # finds that window (one per year in use) as a slice instead of masking every row
+    picked_on = df_full['Picked on'].to_numpy()
+    prev_rows = []
+    for month_start, n_days in bounds:
+        window = np.array([month_start - np.timedelta64(9, 'h'), month_start]).astype(picked_on.dtype)
+        lo, hi = np.searchsorted(picked_on.view(np.int64), window.view(np.int64))
+        prev_rows.append(np.arange(lo, hi))
+    prev_day_df = df_full.iloc[np.concatenate(prev_rows)]
+    prev_day_df = prev_day_df[prev_day_df['_is_special_next_day'].to_numpy()]
+    
+    # Only hubs present in this month are reported
+    if hub_column:
+        prev_hub_codes = hubs.get_indexer(prev_day_df[hub_column])
+    else:
+        prev_hub_codes = np.zeros(len(prev_day_df), dtype=np.intp)
+    
+    # Next day orders are ONLY special customer orders picked after 3PM
+    next_day_orders = df_month['_is_special_next_day'].to_numpy() & after_3pm
+    
+    # No such orders in this month or the previous day's window (e.g. a hub with only regular
+    # customers): skip bucketing the whole month just to find nothing
+    if not next_day_orders.any() and not (prev_hub_codes >= 0).any():
+        return same_day_df, pd.DataFrame(columns=NEXT_DAY_COLUMNS)
+    
+    next_day_df = next_day_table(
+        hubs,
+        hub_month_start,
+        hub_n_days,
+        np.concatenate([prev_hub_codes, hub_codes[next_day_orders]]),
+        np.concatenate([day_buckets(prev_day_df, 'Picked on'), picked_day[next_day_orders]]),
+        np.concatenate([day_buckets(prev_day_df, 'First attempted on'), attempted_day[next_day_orders]]),
+        np.concatenate([day_buckets(prev_day_df, 'Delivered on'), delivered_day[next_day_orders]])
     )
     
-    # Define special customers
-    special_customers = [
-        'WESTSIDE UNIT OF TRENT LIMITED', 
-        'TATA CLiQ', 
-        'ZISHTA TRADITIONS PRIVATE LIMITED', 
-        'Ugaoo',
-        'Heads Up for Tails HUFT'
-    ]
-    
-    # Get previous month number and year
-    prev_month = month_num - 1 if month_num > 1 else 12
-    prev_year = min_date.year if month_num > 1 else min_date.year - 1
-    
-    for date in dates_in_month:
-        date_str = date.strftime('%Y-%m-%d')
-        previous_date = date - pd.Timedelta(days=1)
-        
-        # Determine which dataframe to use for the previous day's data
-        if previous_date.month == month_num:
-            # Previous day is in same month - use current month's data
-            prev_day_df = df_month
-        else:
-            # Previous day is in previous month - use previous month's data from full dataframe
-            prev_day_df = df_full[
-                (df_full['Picked on'].dt.month == prev_month) & 
-                (df_full['Picked on'].dt.year == prev_year)
-            ]
-            
-            # Apply hub filter if specified and column exists
-            if hub_filter != "All" and hub_column and hub_column in prev_day_df.columns:
-                prev_day_df = prev_day_df[prev_day_df[hub_column] == hub_filter]
-        
-        # Filter ONLY special customer orders picked after 3PM the previous day
-        special_orders = prev_day_df[
-            (prev_day_df['Customer'].isin(special_customers)) &
-            (prev_day_df['Picked on'].dt.date == previous_date.date()) &
-            (prev_day_df['Picked on'].dt.hour >= 15)
-        ]
-        
-        # Skip if no orders
-        if len(special_orders) == 0:
-            continue
-        
-        # Total next day orders (only special orders picked previous day after 3PM)
-        next_day_orders_count = len(special_orders)
-        
-        # Attempted logic:
-        # 1. First attempted on previous day (same day as picked)
-        attempted_previous_day = len(special_orders[
-            (special_orders['First attempted on'].dt.date == previous_date.date())
-        ])
-        
-        # 2. First attempted on current date (next day)
-        attempted_current_day = len(special_orders[
-            (special_orders['First attempted on'].dt.date == date.date())
-        ])
-        
-        total_attempted = attempted_previous_day + attempted_current_day
-        
-        # Delivered logic:
-        # 1. Delivered on previous day (same day as picked)
-        delivered_previous_day = len(special_orders[
-            (special_orders['Delivered on'].dt.date == previous_date.date())
-        ])
-        
-        # 2. Delivered on current date (next day)
-        delivered_current_day = len(special_orders[
-            (special_orders['Delivered on'].dt.date == date.date())
-        ])
-        
-        total_delivered = delivered_previous_day + delivered_current_day
-        
-        # Calculate percentages
-        attempted_pct = (total_attempted / next_day_orders_count * 100) if next_day_orders_count > 0 else 0
-        delivered_pct = (total_delivered / next_day_orders_count * 100) if next_day_orders_count > 0 else 0
-        
-        # Hub information
-        if hub_filter != "All" and hub_column and hub_column in df_month.columns:
-            hub = hub_filter
-        else:
-            hub = "All Hubs"
-        
-        next_day_data.append({
-            'Date': date_str,
-            'Hub': hub,
-            'Next day Orders': next_day_orders_count,
-            'Attempted': total_attempted,
-            'Attempted %': round(attempted_pct, 2),
-            'Delivered': total_delivered,
-            'Delivered %': round(delivered_pct, 2),
-            'Attempted Previous Day': attempted_previous_day,
-            'Attempted Current Day': attempted_current_day,
-            'Delivered Previous Day': delivered_previous_day,
-            'Delivered Current Day': delivered_current_day
-        })
-    
-    return pd.DataFrame(next_day_data)
+    return same_day_df, next_day_df
+
+# Process same day and next day performance for a month, for one hub or all hubs together;
+# cached so reruns with unchanged inputs skip the work, bounded so hub/month switches can't grow it forever.
+# The frames are derived from the upload, so the cache is keyed on its digest (see load_data) and they
+# are passed as _df_month/_df_full, which Streamlit doesn't hash
+@st.cache_data(show_spinner=False, max_entries=32)
+def process_month(_df_month, _df_full, digest, month_num, hub_filter="All", hub_column=None):
+    # Apply hub filter if specified and column exists
+    if hub_filter != "All" and hub_column and hub_column in _df_month.columns:
+        return month_tables(_df_month[_df_month[hub_column] == hub_filter], _df_full, month_num, hub_column)
+    return month_tables(_df_month, _df_full, month_num)
 
-# Process hub-wise performance for all hubs
-def process_all_hubs_performance(df_month, df_full, month_num, hub_column):
-    if not hub_column or hub_column not in df_month.columns:
+# Process hub-wise performance for all hubs with a single grouped pass over the month (cached like process_month)
+@st.cache_data(show_spinner=False, max_entries=32)
+def process_all_hubs_performance(_df_month, _df_full, digest, month_num, hub_column):
+    if not hub_column or hub_column not in _df_month.columns:
         return pd.DataFrame(), pd.DataFrame()
-        
-    hubs = df_month[hub_column].unique()
-    all_same_day_data = []
-    all_next_day_data = []
-    
-    for hub in hubs:
-        # Process same day performance for this hub
-        same_day_hub = process_same_day(df_month, hub, hub_column)
-        if not same_day_hub.empty:
-            all_same_day_data.append(same_day_hub)
-        
-        # Process next day performance for this hub
-        next_day_hub = process_next_day(df_month, df_full, month_num, hub, hub_column)
-        if not next_day_hub.empty:
-            all_next_day_data.append(next_day_hub)
     
-    # Combine all hub data
-    same_day_all_hubs = pd.concat(all_same_day_data, ignore_index=True) if all_same_day_data else pd.DataFrame()
-    next_day_all_hubs = pd.concat(all_next_day_data, ignore_index=True) if all_next_day_data else pd.DataFrame()
-    
-    return same_day_all_hubs, next_day_all_hubs
+    return month_tables(_df_month, _df_full, month_num, hub_column)
 
-# Process hub-wise performance summary
-def process_hub_performance(df_month, hub_column):
-    if not hub_column or hub_column not in df_month.columns:
+# Process hub-wise performance summary from the already computed per-hub same day table,
+# without scanning the month's rows again (cached like process_month, keyed on the upload digest and month)
+@st.cache_data(show_spinner=False, max_entries=32)
+def process_hub_performance(_same_day_all_hubs, digest, month_num):
+    if _same_day_all_hubs.empty:
         return pd.DataFrame()
-        
-    hubs = df_month[hub_column].unique()
-    hub_data = []
     
-    for hub in hubs:
-        # Same day performance for this hub
-        same_day_hub = process_same_day(df_month, hub, hub_column)
-        
-        if not same_day_hub.empty:
-            hub_attempted_avg = same_day_hub['Attempted %'].mean()
-            hub_delivered_avg = same_day_hub['Delivered %'].mean()
-            
-            hub_data.append({
-                'Hub': hub,
-                'Avg Attempted %': round(hub_attempted_avg, 2),
-                'Avg Delivered %': round(hub_delivered_avg, 2),
-                'Total Orders': same_day_hub['Same day Orders'].sum()
-            })
-    
-    return pd.DataFrame(hub_data)
+    # Average the daily percentages as float64 values rounded to 2 decimals, as they were before the
+    # tables were narrowed, with Series.mean per hub (numpy's pairwise sum, unlike the grouped 'mean'):
+    # float32 or differently summed means can land on the other side of a rounding boundary
+    hub_data = _same_day_all_hubs.astype({'Attempted %': np.float64, 'Delivered %': np.float64})
+    hub_data = hub_data.round({'Attempted %': 2, 'Delivered %': 2})
+    hub_data = hub_data.groupby('Hub', sort=False).agg(**{
+        'Avg Attempted %': ('Attempted %', pd.Series.mean),
+        'Avg Delivered %': ('Delivered %', pd.Series.mean),
+        'Total Orders': ('Same day Orders', 'sum')
+    })
+    
+    return hub_data.round({'Avg Attempted %': 2, 'Avg Delivered %': 2}).astype({
+        'Avg Attempted %': np.float32,
+        'Avg Delivered %': np.float32,
+        'Total Orders': np.int32
+    }).reset_index()
 
-# Process customer-wise performance
-def process_customer_performance(df_month):
-    customer_data = []
+# Process customer-wise performance (cached like process_month, keyed on the upload digest and month)
+@st.cache_data(show_spinner=False, max_entries=32)
+def process_customer_performance(_df_month, digest, month_num):
+    # Same day attempted/delivered flags for the whole month, compared once as datetime64[D] day buckets
+    picked_day = day_buckets(_df_month, 'Picked on')
+    flags = pd.DataFrame({
+        'Customer': _df_month['Customer'],
+        'attempted': day_buckets(_df_month, 'First attempted on') == picked_day,
+        'delivered': day_buckets(_df_month, 'Delivered on') == picked_day
+    })
     
-    # Group by customer and calculate performance metrics
-    for customer, group in df_month.groupby('Customer'):
-        total_orders = len(group)
-        
-        # Calculate same day attempted and delivered
-        same_day_attempted = len(group[group['First attempted on'].dt.date == group['Picked on'].dt.date])
-        same_day_delivered = len(group[group['Delivered on'].dt.date == group['Picked on'].dt.date])
-        
-        # Calculate percentages
-        attempted_pct = (same_day_attempted / total_orders * 100) if total_orders > 0 else 0
-        delivered_pct = (same_day_delivered / total_orders * 100) if total_orders > 0 else 0
-        
-        customer_data.append({
-            'Customer': customer,
-            'Total Orders': total_orders,
-            'Same Day Attempted': same_day_attempted,
-            'Attempted %': round(attempted_pct, 2),
-            'Same Day Delivered': same_day_delivered,
-            'Delivered %': round(delivered_pct, 2)
-        })
-    
-    return pd.DataFrame(customer_data)
+    # Group by customer and calculate performance metrics in one grouped reduction
+    customer_data = flags.groupby('Customer', observed=True).agg(
+        total_orders=('attempted', 'size'),
+        same_day_attempted=('attempted', 'sum'),
+        same_day_delivered=('delivered', 'sum')
+    )
+    total_orders = customer_data['total_orders'].to_numpy(dtype=np.int32)
+    same_day_attempted = customer_data['same_day_attempted'].to_numpy(dtype=np.int32)
+    same_day_delivered = customer_data['same_day_delivered'].to_numpy(dtype=np.int32)
+    
+    # Calculate percentages
+    attempted_pct = percentage(same_day_attempted, total_orders)
+    delivered_pct = percentage(same_day_delivered, total_orders)
+    
+    return pd.DataFrame({
+        'Customer': customer_data.index.to_numpy(),
+        'Total Orders': total_orders,
+        'Same Day Attempted': same_day_attempted,
+        'Attempted %': attempted_pct,
+        'Same Day Delivered': same_day_delivered,
+        'Delivered %': delivered_pct
+    })
 
-# Apply full cell color formatting
-def color_cells(val):
-    if isinstance(val, (int, float)):
-        if val >= 95:
-            return 'background-color: #4CAF50; color: white'  # Green
-        elif val >= 85:
-            return 'background-color: #FFEB3B; color: black'  # Yellow
-        else:
-            return 'background-color: #F44336; color: white'  # Red
-    return ''
+# Apply full cell color formatting to a whole column at once
+def color_column(col):
+    return np.select(
+        [col >= 95, col >= 85],
+        [
+            'background-color: #4CAF50; color: white',  # Green
+            'background-color: #FFEB3B; color: black'   # Yellow
+        ],
+        default='background-color: #F44336; color: white'  # Red
+    )
 
 # Format the entire dataframe with color
 def format_dataframe(df, percentage_cols):
-    # Apply to percentage columns
-    styled_df = df.style.applymap(color_cells, subset=percentage_cols)
+    # Colors come from the numeric percentage values
+    colors = pd.DataFrame({col: color_column(df[col]) for col in percentage_cols}, index=df.index)
     
-    # Format numeric columns
+    # Format percentage columns up front with one vectorized call per column
+    display_df = df.copy()
     for col in df.columns:
         if '%' in col:
-            styled_df = styled_df.format({col: '{:.1f}%'})
-        elif 'Orders' in col or 'Attempted' in col or 'Delivered' in col:
-            styled_df = styled_df.format({col: '{:.0f}'})
+            display_df[col] = np.char.mod('%.1f%%', df[col].to_numpy(dtype=float))
+    
+    # Apply to percentage columns
+    styled_df = display_df.style.apply(lambda _: colors, axis=None, subset=percentage_cols)
+    
+    # Format remaining numeric columns with a single formatter mapping
+    styled_df = styled_df.format({
+        col: '{:.0f}' for col in df.columns
+        if '%' not in col and ('Orders' in col or 'Attempted' in col or 'Delivered' in col)
+    })
     
     # Set table properties
     styled_df = styled_df.set_properties(**{
@@ -332,79 +438,121 @@ def format_dataframe(df, percentage_cols):
     
     return styled_df
 
+# Column configuration that formats the numeric columns in the browser:
+# percentages as progress bars, counts as whole numbers
+def numeric_column_config(df):
+    config = {}
+    for col in df.columns:
+        if '%' in col:
+            config[col] = st.column_config.ProgressColumn(col, format='%.1f%%', min_value=0, max_value=100)
+        elif 'Orders' in col or 'Attempted' in col or 'Delivered' in col:
+            config[col] = st.column_config.NumberColumn(col, format='%d')
+    return config
+
+# Display a table; the color-coded Styler view is only built when requested,
+# otherwise the raw numbers are sent and formatted client-side
+def show_table(df, percentage_cols, color_coded):
+    if color_coded:
+        st.dataframe(format_dataframe(df, percentage_cols), use_container_width=True)
+    else:
+        st.dataframe(df, column_config=numeric_column_config(df), use_container_width=True)
+
 # Plot comparison graphs
 def plot_comparison(same_day_df, next_day_df, month_name, hub_name):
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+    # Imported on first use so reruns that don't draw the chart skip loading plotly
+    import plotly.express as px
     
-    # Attempted % comparison
-    ax1.plot(same_day_df['Date'], same_day_df['Attempted %'], label='Same Day', marker='o')
-    if not next_day_df.empty:
-        ax1.plot(next_day_df['Date'], next_day_df['Attempted %'], label='Next Day', marker='o')
-    ax1.set_title(f'{month_name} - {hub_name} - Attempted % Comparison')
-    ax1.set_ylabel('Percentage')
-    ax1.legend()
-    ax1.grid(True)
-    ax1.tick_params(axis='x', rotation=45)
-    
-    # Delivered % comparison
-    ax2.plot(same_day_df['Date'], same_day_df['Delivered %'], label='Same Day', marker='o')
+    # Build one tidy frame of (Date, Series, Metric, Percentage) rows for both series
+    series = [same_day_df[['Date', 'Attempted %', 'Delivered %']].assign(Series='Same Day')]
     if not next_day_df.empty:
-        ax2.plot(next_day_df['Date'], next_day_df['Delivered %'], label='Next Day', marker='o')
-    ax2.set_title(f'{month_name} - {hub_name} - Delivered % Comparison')
-    ax2.set_ylabel('Percentage')
-    ax2.legend()
-    ax2.grid(True)
-    ax2.tick_params(axis='x', rotation=45)
-    
-    plt.tight_layout()
-    st.pyplot(fig)
+        series.append(next_day_df[['Date', 'Attempted %', 'Delivered %']].assign(Series='Next Day'))
+    chart_df = pd.concat(series, ignore_index=True).melt(
+        id_vars=['Date', 'Series'],
+        value_vars=['Attempted %', 'Delivered %'],
+        var_name='Metric',
+        value_name='Percentage'
+    )
+    
+    # Attempted % and Delivered % comparison, one facet row each
+    fig = px.line(
+        chart_df,
+        x='Date',
+        y='Percentage',
+        color='Series',
+        facet_row='Metric',
+        markers=True,
+        height=700,
+        title=f'{month_name} - {hub_name} - Attempted % / Delivered % Comparison'
+    )
+    fig.update_yaxes(matches=None)
+    
+    st.plotly_chart(fig, use_container_width=True)
 
-# Plot hub performance
+# Plot hub performance with Altair bar charts, which Vega-Lite renders in the browser (no server-side figure)
 def plot_hub_performance(hub_df, month_name):
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-    
-    # Sort by performance
-    hub_df_sorted = hub_df.sort_values('Avg Attempted %', ascending=False)
-    
-    # Attempted % by hub
-    ax1.bar(hub_df_sorted['Hub'], hub_df_sorted['Avg Attempted %'])
-    ax1.set_title(f'{month_name} - Avg Attempted % by Hub')
-    ax1.set_ylabel('Percentage')
-    ax1.tick_params(axis='x', rotation=45)
-    
-    # Delivered % by hub
-    hub_df_sorted = hub_df.sort_values('Avg Delivered %', ascending=False)
-    ax2.bar(hub_df_sorted['Hub'], hub_df_sorted['Avg Delivered %'])
-    ax2.set_title(f'{month_name} - Avg Delivered % by Hub')
-    ax2.set_ylabel('Percentage')
-    ax2.tick_params(axis='x', rotation=45)
-    
-    plt.tight_layout()
-    st.pyplot(fig)
+    # Imported on first use, see plot_comparison
+    import altair as alt
+    
+    col1, col2 = st.columns(2)
+    
+    # Attempted % by hub, sorted by performance
+    with col1:
+        st.altair_chart(
+            alt.Chart(hub_df, title=f'{month_name} - Avg Attempted % by Hub').mark_bar().encode(
+                x=alt.X('Hub:N', sort='-y'),
+                y=alt.Y('Avg Attempted %:Q', title='Percentage')
+            ),
+            use_container_width=True
+        )
+    
+    # Delivered % by hub, sorted by performance
+    with col2:
+        st.altair_chart(
+            alt.Chart(hub_df, title=f'{month_name} - Avg Delivered % by Hub').mark_bar().encode(
+                x=alt.X('Hub:N', sort='-y'),
+                y=alt.Y('Avg Delivered %:Q', title='Percentage')
+            ),
+            use_container_width=True
+        )
 
-# Plot customer performance
+# Plot customer performance, see plot_hub_performance
 def plot_customer_performance(customer_df, month_name):
+    import altair as alt
+    
     # Filter to top 10 customers by order volume
     top_customers = customer_df.nlargest(10, 'Total Orders')
     
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    # Customers keep their order volume ranking, largest first
+    customer_order = list(top_customers['Customer'])
+    
+    col1, col2 = st.columns(2)
     
     # Attempted % by customer
-    ax1.barh(top_customers['Customer'], top_customers['Attempted %'])
-    ax1.set_title(f'{month_name} - Attempted % by Customer (Top 10)')
-    ax1.set_xlabel('Percentage')
+    with col1:
+        st.altair_chart(
+            alt.Chart(top_customers, title=f'{month_name} - Attempted % by Customer (Top 10)').mark_bar().encode(
+                x=alt.X('Attempted %:Q', title='Percentage'),
+                y=alt.Y('Customer:N', sort=customer_order)
+            ),
+            use_container_width=True
+        )
     
     # Delivered % by customer
-    ax2.barh(top_customers['Customer'], top_customers['Delivered %'])
-    ax2.set_title(f'{month_name} - Delivered % by Customer (Top 10)')
-    ax2.set_xlabel('Percentage')
-    
-    plt.tight_layout()
-    st.pyplot(fig)
+    with col2:
+        st.altair_chart(
+            alt.Chart(top_customers, title=f'{month_name} - Delivered % by Customer (Top 10)').mark_bar().encode(
+                x=alt.X('Delivered %:Q', title='Percentage'),
+                y=alt.Y('Customer:N', sort=customer_order)
+            ),
+            use_container_width=True
+        )
 
-# Convert DataFrame to CSV for download
+# Convert DataFrame to CSV for download, encoding straight into a byte buffer
+# instead of building the whole CSV as a str first
 def convert_df_to_csv(df):
-    return df.to_csv(index=False).encode('utf-8')
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False, encoding='utf-8')
+    return buffer.getvalue()
 
 # Main Streamlit app
 def main():
@@ -413,22 +561,22 @@ def main():
     uploaded_file = st.file_uploader("Upload your delivery data CSV file", type=["csv"])
     
     if uploaded_file is not None:
-        df = load_data(uploaded_file)
+        df, month_groups = load_data(uploaded_file)
         
         # Find hub column name
-        hub_column = find_hub_column(df)
+        hub_column = find_hub_column(df.columns)
         has_hub_column = hub_column is not None
         
         # Get unique hubs for filtering if column exists
         if has_hub_column:
-            all_hubs = ["All"] + list(df[hub_column].unique())
+            all_hubs = ["All"] + list(df[hub_column].cat.categories)
             st.write(f"Detected hub column: '{hub_column}'")
         else:
             all_hubs = ["All"]
             st.warning("No hub column found in the data. Showing overall performance only.")
             # Show available columns to help identify the hub column
             st.write("Available columns in your CSV:")
-            st.write(list(df.columns))
+            st.write(df.attrs['source_columns'])
         
         # Create tabs for July, August, September only
         tab_names = ["July", "August", "September"]
@@ -454,18 +602,31 @@ def main():
                 else:
                     selected_hub = "All"
                 
-                # Filter data for the month
-                month_data = filter_month_data(df, month_num)
+                # Color-coded tables need server-side Styler rendering, so they are opt-in
+                color_coded = st.checkbox("Color-code performance tables", key=f"color_tables_{month_name}")
                 
-                if not month_data.empty:
+                if month_num in month_groups:
+                    year, month_data = month_groups[month_num]
+                    
                     # Process data for same day and next day performance
-                    same_day_df = process_same_day(month_data, selected_hub, hub_column)
-                    next_day_df = process_next_day(month_data, df, month_num, selected_hub, hub_column)
+                    same_day_df, next_day_df = process_month(
+                        month_data, df, df.attrs['digest'], month_num, selected_hub, hub_column
+                    )
                     
                     # Process hub-wise data for CSV export
+                    same_day_all_hubs, next_day_all_hubs = process_all_hubs_performance(
+                        month_data, df, df.attrs['digest'], month_num, hub_column
+                    )
+                    
+                    # Rows are sorted by pick time, so the last row has the latest year
+                    last_year = month_data['Picked on'].iloc[-1].year
+                    if last_year != year:
+                        st.warning(
+                            f"{month_name} data spans {year} to {last_year}: same day and customer tables "
+                            f"include every year, the next day table covers each hub's earliest year only."
+                        )
+                    
                     if has_hub_column:
-                        same_day_all_hubs, next_day_all_hubs = process_all_hubs_performance(month_data, df, month_num, hub_column)
-                        
                         # Add download buttons for hub-wise data
                         col1, col2 = st.columns(2)
                         with col1:
@@ -490,25 +651,25 @@ def main():
                                     key=f"next_day_dl_{month_name}"
                                 )
                     
-                    # Display Same Day table with full color formatting
+                    # Display Same Day table
                     st.subheader("Same Day Performance")
                     if not same_day_df.empty:
-                        styled_same_day = format_dataframe(
+                        show_table(
                             same_day_df[['Date', 'Hub', 'Same day Orders', 'Attempted', 'Attempted %', 'Delivered', 'Delivered %']],
-                            percentage_cols=['Attempted %', 'Delivered %']
+                            percentage_cols=['Attempted %', 'Delivered %'],
+                            color_coded=color_coded
                         )
-                        st.dataframe(styled_same_day, use_container_width=True)
                     else:
                         st.info("No same day data available for the selected criteria")
                     
-                    # Display Next Day table with full color formatting
+                    # Display Next Day table
                     st.subheader("Next Day Performance (Special Customers after 3PM only)")
                     if not next_day_df.empty:
-                        styled_next_day = format_dataframe(
+                        show_table(
                             next_day_df[['Date', 'Hub', 'Next day Orders', 'Attempted', 'Attempted %', 'Delivered', 'Delivered %']],
-                            percentage_cols=['Attempted %', 'Delivered %']
+                            percentage_cols=['Attempted %', 'Delivered %'],
+                            color_coded=color_coded
                         )
-                        st.dataframe(styled_next_day, use_container_width=True)
                     else:
                         st.info("No next day data available for the selected criteria")
                     
@@ -529,33 +690,35 @@ def main():
                     # Show comparison graphs if we have data
                     if not same_day_df.empty:
                         st.subheader("Performance Comparison")
-                        plot_comparison(same_day_df, next_day_df, month_name, selected_hub)
+                        # Only build the chart when asked for, instead of for every tab on every rerun
+                        if st.checkbox("Show comparison chart", key=f"show_chart_{month_name}"):
+                            plot_comparison(same_day_df, next_day_df, month_name, selected_hub)
                     
                     # Show hub-wise performance if "All" is selected and hub data exists
                     if selected_hub == "All" and has_hub_column:
                         st.subheader("Hub-wise Performance Summary")
-                        hub_performance = process_hub_performance(month_data, hub_column)
+                        hub_performance = process_hub_performance(same_day_all_hubs, df.attrs['digest'], month_num)
                         if not hub_performance.empty:
-                            styled_hub = format_dataframe(
+                            show_table(
                                 hub_performance,
-                                percentage_cols=['Avg Attempted %', 'Avg Delivered %']
+                                percentage_cols=['Avg Attempted %', 'Avg Delivered %'],
+                                color_coded=color_coded
                             )
-                            st.dataframe(styled_hub, use_container_width=True)
                             
                             # Plot hub performance
                             plot_hub_performance(hub_performance, month_name)
                     
                     # Show customer-wise performance
                     st.subheader("Customer-wise Performance")
-                    customer_performance = process_customer_performance(month_data)
+                    customer_performance = process_customer_performance(month_data, df.attrs['digest'], month_num)
                     if not customer_performance.empty:
                         # Display top 10 customers by volume
                         top_customers = customer_performance.nlargest(10, 'Total Orders')
-                        styled_customers = format_dataframe(
+                        show_table(
                             top_customers,
-                            percentage_cols=['Attempted %', 'Delivered %']
+                            percentage_cols=['Attempted %', 'Delivered %'],
+                            color_coded=color_coded
                         )
-                        st.dataframe(styled_customers, use_container_width=True)
                         
                         # Plot customer performance
                         plot_customer_performance(customer_performance, month_name)